@@ -1 +1,27 @@
-from .puzzle import load_puzzle, solve_puzzle
+# Submodules (and NumPy with them) are imported on first attribute access, so that
+# `import polyform_puzzle_solver` stays cheap for short-lived processes.
+_SUBMODULES = ("grid", "polyform", "puzzle", "store")
+_LAZY_ATTRS = {
+    "load_puzzle": "puzzle",
+    "register_yaml_tags": "puzzle",
+    "solve_puzzle": "puzzle",
+    "SolutionStore": "store",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    import importlib
+
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_SUBMODULES, *_LAZY_ATTRS})
@@ -1,7 +1,5 @@
 from dataclasses import dataclass
 
-import yaml
-
 from .grid import CubeGrid, Grid, HexGrid, SquareGrid
 
 
@@ -15,7 +13,7 @@ class Polyform(Grid):
 
     def post_init(self):
         self.grid = self.grid_cls().from_text(self.shape)
-        self.candidates = [p.to_numpy() for p in set(self.gen_candidates())]
+        self.candidates = [p.to_numpy() for p in dict.fromkeys(self.gen_candidates())]
         return self
 
     def area(self):
@@ -30,13 +28,13 @@ class Polyform(Grid):
             basic_forms = [g.rotate() for g in basic_forms]
 
 
-class Polyomino(Polyform, yaml.YAMLObject):
+class Polyomino(Polyform):
     yaml_tag = "!Polyomino"
     grid_cls = SquareGrid
     degrees_of_rotation = 90
 
 
-class Polyhex(Polyform, yaml.YAMLObject):
+class Polyhex(Polyform):
     yaml_tag = "!Polyhex"
     grid_cls = HexGrid
     degrees_of_rotation = 60
@@ -1,14 +1,14 @@
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import cache
 from pprint import pprint
 from typing import Any
 
 import numpy as np
-import yaml
-from tqdm import tqdm
 
 from .grid import Position
 from .polyform import Polyform
+from .store import SolutionStore
 
 
 class StopRecursion(Exception):
@@ -16,7 +16,7 @@ class StopRecursion(Exception):
 
 
 @dataclass
-class Puzzle(yaml.YAMLObject):
+class Puzzle:
     yaml_tag = "!Puzzle"
 
     shape: str
@@ -59,7 +59,12 @@ class Puzzle(yaml.YAMLObject):
         self.state[ranges] -= piece
 
     def update(self, solution, pid):
-        self.solutions.append(solution.copy())
+        if isinstance(self.solutions, SolutionStore):
+            if not self.solutions.add(solution):
+                # symmetric to a stored solution
+                return
+        else:
+            self.solutions.append(solution.copy())
         self.pbar.update()
         if self.limit != -1 and len(self.solutions) == self.limit:
             raise StopRecursion(pid)
@@ -82,6 +87,8 @@ class Puzzle(yaml.YAMLObject):
             print(prefix + desc, sep="")
             return seq
         else:
+            from tqdm import tqdm
+
             prefix = self.prefix["Count & Level"]
             desc = desc.ljust(self.indent)[: self.indent]
             return tqdm(tuple(seq), desc=prefix + desc, leave=False)
@@ -151,6 +158,8 @@ class Puzzle(yaml.YAMLObject):
         if self.solutions:
             return self.solutions
         self.set_params(leave_trace=leave_trace, indent=indent, limit=limit)
+        from tqdm import tqdm
+
         with tqdm(desc="solutions found", leave=False) as self.pbar:
             if self.leave_trace:
                 print()
@@ -174,15 +183,54 @@ class Puzzle(yaml.YAMLObject):
         return {i: self.visualize_solution(i) for i, _ in enumerate(self.solutions)}
 
 
+@cache
+def register_yaml_tag(cls):
+    import yaml
+
+    for loader in [yaml.Loader, yaml.FullLoader, yaml.UnsafeLoader]:
+        yaml.add_constructor(
+            cls.yaml_tag,
+            lambda loader, node: loader.construct_yaml_object(node, cls),
+            Loader=loader,
+        )
+    yaml.add_representer(
+        cls,
+        lambda dumper, data: dumper.represent_yaml_object(cls.yaml_tag, data, cls),
+        Dumper=yaml.Dumper,
+    )
+
+
+def register_yaml_tags():
+    """Register the `!Puzzle`, `!Polyomino`, ... tags with PyYAML, as `yaml.YAMLObject`
+    would: for `Puzzle`, `Polyform` and every subclass of them, at any depth, that defines
+    its own `yaml_tag`. Called by `load_puzzle`; call it before using `yaml.load` or
+    `yaml.dump` directly, and again after defining new tagged subclasses.
+
+    PyYAML is imported on registration rather than at module level to keep it out of
+    import time.
+    """
+    classes = [Puzzle, Polyform]
+    while classes:
+        cls = classes.pop()
+        classes += cls.__subclasses__()
+        if vars(cls).get("yaml_tag") is not None:
+            register_yaml_tag(cls)
+
+
 def load_puzzle(filepath):
+    import yaml
+
+    register_yaml_tags()
     with open(filepath) as f:
         puzzle = yaml.load(f, Loader=yaml.FullLoader)
     return puzzle.post_init()
 
 
 @contextmanager
-def solve_puzzle(filepath, **kwargs):
+def solve_puzzle(filepath, store=None, **kwargs):
     puzzle = load_puzzle(filepath)
+    if store is not None:
+        puzzle.solutions = SolutionStore.create(store, puzzle)
     try:
         yield puzzle
         puzzle.solve(**kwargs)
@@ -190,6 +238,10 @@ def solve_puzzle(filepath, **kwargs):
         pass
     finally:
         num = len(puzzle.solutions)
-        for visualized_solution in map(puzzle.visualize_solution, range(num)):
-            print(visualized_solution)
-        print(num, "solutions found.")
+        if store is None:
+            for visualized_solution in map(puzzle.visualize_solution, range(num)):
+                print(visualized_solution)
+            print(num, "solutions found.")
+        else:
+            puzzle.solutions.close()
+            print(num, "solutions saved to", store)
@@ -0,0 +1,272 @@
+import hashlib
+import io
+import struct
+import zlib
+
+import numpy as np
+
+from .grid import Position
+
+# File layout:
+#   header  : MAGIC, VERSION, #pieces, dim, records per block, puzzle fingerprint
+#   blocks  : (compressed length: uint32, zlib-compressed records)*
+#   index   : uint64 file offset of each block
+#   trailer : uint64 offset of the index, uint64 #blocks, uint64 #solutions, MAGIC
+# The index and trailer are written on `close`; without them (e.g. if the solver was
+# killed) the index is rebuilt on `open` from the blocks that were written completely.
+# A record is an int16 array of shape (#pieces, 1 + dim) holding `(cid, *offset)`
+# for each piece, where `cid == -1` marks a piece left out of the solution.
+MAGIC = b"PPSS"
+VERSION = 2
+HEADER = struct.Struct("<4sHHHI16s")
+BLOCK = struct.Struct("<I")
+TRAILER = struct.Struct("<QQQ4s")
+UNUSED = -1
+DIGEST_SIZE = 16
+
+
+def puzzle_fingerprint(puzzle):
+    """Digest of the board and of every piece's candidates, in the order that the
+    `cid` of a record refers to."""
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+    def update(array):
+        h.update(np.array(array.shape, dtype="<i8").tobytes())
+        h.update(np.ascontiguousarray(array, dtype=np.int8).tobytes())
+
+    update(puzzle.state)
+    for piece in puzzle.puzzle_pieces:
+        h.update(len(piece.candidates).to_bytes(8, "little"))
+        for candidate in piece.candidates:
+            update(candidate)
+    return h.digest()
+
+
+def gen_board_symmetries(puzzle):
+    """Yield, for each symmetry of the board, an index array `perm` such that
+    `np.append(cells.ravel(), 0)[perm]` is `cells` transformed by that symmetry.
+
+    Only symmetries mapping solutions to solutions are yielded: reflections are left
+    out if some piece may not be flipped, since its candidates are then not closed
+    under them."""
+    shape = puzzle.state.shape
+    labeled = puzzle.grid(lambda p: p)
+    for position in labeled.sparse:
+        labeled.sparse[position] = np.ravel_multi_index(tuple(position), shape)
+
+    degrees_of_rotation = puzzle.puzzle_pieces[0].degrees_of_rotation or 360
+    forms = [labeled]
+    if degrees_of_rotation != 360 and all(piece.flip for piece in puzzle.puzzle_pieces):
+        forms.append(labeled.flip_horizontal())
+    num_basic_forms = len(forms)
+    for _ in range(360 // degrees_of_rotation - 1):
+        forms += [form.rotate() for form in forms[-num_basic_forms:]]
+
+    perms = set()
+    for form in forms:
+        if tuple(form.size()) != shape or np.any(form.to_numpy() != puzzle.state):
+            continue
+        perm = np.full(shape, puzzle.state.size, dtype=np.intp)
+        for position, index in form.sparse.items():
+            perm[tuple(position)] = index
+        perm = perm.ravel()
+        if perm.tobytes() not in perms:
+            perms.add(perm.tobytes())
+            yield perm
+
+
+class SolutionStore:
+    """Compressed on-disk sequence of solutions.
+
+    Behaves like the `Puzzle.solutions` list (`len`, indexing), so it can be assigned
+    to `puzzle.solutions` to stream solutions to `filepath` while solving (through
+    `add`) and to render stored ones lazily with `puzzle.visualize_solution(sid)`.
+    """
+
+    def __init__(self, file, num_pieces, dim, block_size, fingerprint):
+        self.file = file
+        self.num_pieces = num_pieces
+        self.dim = dim
+        self.block_size = block_size
+        self.fingerprint = fingerprint
+        self.record_dtype = np.dtype(("<i2", (num_pieces, 1 + dim)))
+        self.block_offsets = []
+        self.num_flushed = 0
+        self.buffer = []
+        self.cache = (None, None)
+        self.writable = False
+        self.puzzle = None
+        # symmetries of the board, used to skip solutions symmetric to another one
+        # (`None` if disabled)
+        self.perms = None
+
+    @classmethod
+    def create(cls, filepath, puzzle, *, dedup=True, block_size=1024):
+        fingerprint = puzzle_fingerprint(puzzle)
+        num_pieces, dim = len(puzzle.puzzle_pieces), puzzle.grid.dim
+        store = cls(open(filepath, "w+b"), num_pieces, dim, block_size, fingerprint)
+        store.file.write(HEADER.pack(MAGIC, VERSION, num_pieces, dim, block_size, fingerprint))
+        store.writable = True
+        store.attach(puzzle)
+        if dedup:
+            store.perms = list(gen_board_symmetries(puzzle))
+        return store
+
+    @classmethod
+    def open(cls, filepath, puzzle):
+        file = open(filepath, "rb")
+        try:
+            magic, version, *params = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a solution store: {filepath}")
+            store = cls(file, *params)
+            if not store.read_index():
+                store.recover_index()
+            store.attach(puzzle)
+        except struct.error as e:
+            file.close()
+            raise ValueError(f"Not a solution store: {filepath}") from e
+        except BaseException:
+            file.close()
+            raise
+        return store
+
+    def read_index(self):
+        """Read the block index written by `close`; return False if it is missing."""
+        size = self.file.seek(0, 2)
+        if size < HEADER.size + TRAILER.size:
+            return False
+        self.file.seek(size - TRAILER.size)
+        index_offset, num_blocks, num_solutions, magic = TRAILER.unpack(
+            self.file.read(TRAILER.size)
+        )
+        if magic != MAGIC or index_offset + 8 * num_blocks + TRAILER.size != size:
+            return False
+        self.file.seek(index_offset)
+        self.block_offsets = np.frombuffer(self.file.read(8 * num_blocks), dtype="<u8").tolist()
+        self.num_flushed = num_solutions
+        return True
+
+    def recover_index(self):
+        """Rebuild the block index by walking the blocks after the header, stopping at
+        the first one that is truncated or corrupt."""
+        offset = self.file.seek(HEADER.size)
+        while len(prefix := self.file.read(BLOCK.size)) == BLOCK.size:
+            (length,) = BLOCK.unpack(prefix)
+            try:
+                data = zlib.decompress(self.file.read(length))
+            except zlib.error:
+                break
+            num_records, rest = divmod(len(data), self.record_dtype.itemsize)
+            if rest or not 0 < num_records <= self.block_size:
+                break
+            self.block_offsets.append(offset)
+            self.num_flushed += num_records
+            offset += BLOCK.size + length
+            if num_records < self.block_size:
+                # only the last block written by `close` may be partial
+                break
+
+    def attach(self, puzzle):
+        """Check that the records of this store refer to the pieces of `puzzle`."""
+        if (self.num_pieces, self.dim) != (len(puzzle.puzzle_pieces), puzzle.grid.dim):
+            raise ValueError(
+                f"Store of {self.num_pieces} pieces in {self.dim}D does not match puzzle "
+                f"{puzzle.name!r} of {len(puzzle.puzzle_pieces)} pieces in {puzzle.grid.dim}D"
+            )
+        if self.fingerprint != puzzle_fingerprint(puzzle):
+            raise ValueError(f"Store was not created for puzzle {puzzle.name!r}")
+        self.puzzle = puzzle
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.num_flushed + len(self.buffer)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return (self[sid] for sid in range(len(self)))
+
+    def __getitem__(self, sid):
+        if not -len(self) <= sid < len(self):
+            raise IndexError(sid)
+        sid %= len(self)
+        if sid < self.num_flushed:
+            record = self.read_block(sid // self.block_size)[sid % self.block_size]
+        else:
+            record = self.buffer[sid - self.num_flushed]
+        return [
+            (pid, int(cid), Position(*map(int, offset)))
+            for pid, (cid, *offset) in enumerate(record)
+            if cid != UNUSED
+        ]
+
+    def is_canonical(self, record):
+        """Whether `record` is the representative of its class of symmetric solutions,
+        i.e. its cell-to-piece array is the smallest of its images under `self.perms`.
+
+        The solver enumerates every solution, so each class is stored exactly once
+        without remembering the solutions seen so far."""
+        # big-endian, so that comparing bytes compares labels lexicographically
+        cells = np.zeros(self.puzzle.state.size + 1, dtype=">u2")
+        board = cells[:-1].reshape(self.puzzle.state.shape)  # the last cell stays 0 for `perm`
+        for pid, (cid, *offset) in enumerate(record):
+            if cid == UNUSED:
+                continue
+            candidate = self.puzzle.puzzle_pieces[pid].candidates[cid]
+            ranges = tuple(slice(i, i + k) for i, k in zip(offset, candidate.shape))
+            board[ranges] += candidate.astype(cells.dtype) * (pid + 1)
+        key = cells[:-1].tobytes()
+        return all(key <= cells[perm].tobytes() for perm in self.perms)
+
+    def add(self, solution):
+        """Add `solution`; return False if it is skipped as symmetric to another one."""
+        if not self.writable:
+            raise io.UnsupportedOperation("store opened read-only")
+        record = np.full(self.record_dtype.shape, UNUSED, dtype=np.int16)
+        for pid, cid, offset in solution:
+            record[pid] = (cid, *offset)
+        if self.perms is not None and not self.is_canonical(record):
+            return False
+        self.buffer.append(record)
+        if len(self.buffer) == self.block_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        if not self.buffer:
+            return
+        data = zlib.compress(np.array(self.buffer, dtype=np.int16).astype("<i2").tobytes())
+        self.file.seek(0, 2)
+        self.block_offsets.append(self.file.tell())
+        self.file.write(BLOCK.pack(len(data)))
+        self.file.write(data)
+        self.file.flush()
+        self.num_flushed += len(self.buffer)
+        self.buffer = []
+
+    def read_block(self, bid):
+        if self.cache[0] != bid:
+            self.file.seek(self.block_offsets[bid])
+            (length,) = BLOCK.unpack(self.file.read(BLOCK.size))
+            data = zlib.decompress(self.file.read(length))
+            self.cache = (bid, np.frombuffer(data, dtype=self.record_dtype))
+        return self.cache[1]
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.writable:
+            self.flush()
+            self.file.seek(0, 2)
+            index_offset = self.file.tell()
+            self.file.write(np.array(self.block_offsets, dtype="<u8").tobytes())
+            self.file.write(TRAILER.pack(index_offset, len(self.block_offsets), len(self), MAGIC))
+            self.writable = False
+        self.file.close()
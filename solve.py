@@ -1,13 +1,14 @@
 from argparse import ArgumentParser
 
-import numpy as np
 
-from polyform_puzzle_solver import solve_puzzle
+def main(puzzle_name, **options):
+    # imported here so that e.g. `--help` does not pay for NumPy
+    import numpy as np
 
-np.set_printoptions(edgeitems=30, linewidth=10**5, formatter=dict(float=lambda x: "%.3g" % x))
+    from polyform_puzzle_solver import solve_puzzle
 
+    np.set_printoptions(edgeitems=30, linewidth=10**5, formatter=dict(float=lambda x: "%.3g" % x))
 
-def main(puzzle_name, **options):
     with solve_puzzle(f"puzzles/{puzzle_name}.yaml", **options) as puzzle:
         print("-" * 20)
         print(f"=== Puzzle Name: {puzzle.name} ===")
@@ -46,6 +47,13 @@ if __name__ == "__main__":
         default=-1,
         help="Limit the number of solutions to find (-1 for unlimited).",
     )
+    parser.add_argument(
+        "--store",
+        "-s",
+        type=str,
+        default=None,
+        help="If given, save solutions up to board symmetry to this file instead of printing.",
+    )
 
     args = vars(parser.parse_args())
     puzzle_name = args.pop("puzzle-name")
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ["numpy", "yaml", "tqdm"]
+
+
+def import_times(statement):
+    """Run `statement` under `python -X importtime` and return
+    {module: (self [us], cumulative [us])} for every module it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_package_import_is_lazy():
+    times = import_times("import polyform_puzzle_solver")
+    assert "polyform_puzzle_solver" in times
+    assert not any(module in times for module in HEAVY_MODULES)
+
+
+def test_cli_help_is_lazy():
+    times = import_times("import solve")
+    assert not any(module in times for module in ["polyform_puzzle_solver", *HEAVY_MODULES])
+
+
+def test_load_puzzle_defers_tqdm():
+    times = import_times("from polyform_puzzle_solver import load_puzzle")
+    assert "numpy" in times
+    assert not any(module in times for module in ["yaml", "tqdm"])
+
+
+if __name__ == "__main__":
+    for statement in [
+        "import polyform_puzzle_solver",
+        "from polyform_puzzle_solver import load_puzzle",
+        "import polyform_puzzle_solver.puzzle, yaml, tqdm",
+    ]:
+        times = import_times(statement)
+        print(f"=== {statement} ===")
+        for module in ["polyform_puzzle_solver", "polyform_puzzle_solver.puzzle", *HEAVY_MODULES]:
+            if module in times:
+                print(f"{module:>30}: {times[module][1] / 1000:8.2f} ms (cumulative)")
+        print(f"{'total':>30}: {sum(t[0] for t in times.values()) / 1000:8.2f} ms")
@@ -1,7 +1,44 @@
 from pprint import pprint
 
+import yaml
+
 import polyform_puzzle_solver as solver
+from polyform_puzzle_solver.polyform import Polyomino
+from polyform_puzzle_solver.puzzle import Puzzle
+
+
+def test_load_puzzle():
+    puzzle = solver.load_puzzle("./puzzles/Polyomino/3x4-2p-1.yaml")
+    assert isinstance(puzzle, Puzzle)
+    assert [piece.name for piece in puzzle.puzzle_pieces] == ["1", "2"]
+
+
+def test_yaml_tags():
+    solver.register_yaml_tags()
+    for loader in [yaml.Loader, yaml.FullLoader, yaml.UnsafeLoader]:
+        with open("./puzzles/Polyhex/4x8-3p-1.yaml") as f:
+            assert isinstance(yaml.load(f, Loader=loader), Puzzle)
+
+    dumped = yaml.dump(Polyomino(shape="oo", name="domino"))
+    assert dumped.startswith("!Polyomino")
+    assert yaml.load(dumped, Loader=yaml.FullLoader) == Polyomino(shape="oo", name="domino")
+
+
+def test_yaml_tags_of_subclasses():
+    solver.register_yaml_tags()
+
+    # defined after the first registration and not a direct subclass of `Polyform`
+    class Domino(Polyomino):
+        yaml_tag = "!Domino"
+
+    solver.register_yaml_tags()
+    dumped = yaml.dump(Domino(shape="oo", name="domino"))
+    assert dumped.startswith("!Domino")
+    loaded = yaml.load(dumped, Loader=yaml.FullLoader)
+    assert isinstance(loaded, Domino)
+    assert loaded == Domino(shape="oo", name="domino")
+
 
 if __name__ == "__main__":
-    puzzle = solver.load_puzzle("./puzzles/3x4-2p.yaml")
+    puzzle = solver.load_puzzle("./puzzles/Polyomino/3x4-2p-1.yaml")
     pprint(puzzle.__dict__)
@@ -0,0 +1,140 @@
+import io
+
+import pytest
+
+from polyform_puzzle_solver.polyform import Polyhex, Polyomino
+from polyform_puzzle_solver.puzzle import Puzzle
+from polyform_puzzle_solver.store import TRAILER, SolutionStore, gen_board_symmetries
+
+
+def make_puzzle(p1_flip=True, p2_flip=True):
+    return Puzzle(
+        name="3x4-2p-1",
+        shape="oooo\no_oo\noooo",
+        puzzle_pieces=[
+            Polyomino(shape="oooo\no___", name="p1", flip=p1_flip),
+            Polyomino(shape="oooo\n__oo", name="p2", flip=p2_flip),
+        ],
+    ).post_init()
+
+
+def make_domino_puzzle():
+    return Puzzle(
+        name="2x4-dominoes",
+        shape="oooo\noooo",
+        puzzle_pieces=[Polyomino(shape="oo", name=str(i)) for i in range(4)],
+    ).post_init()
+
+
+def make_hexagon_puzzle():
+    return Puzzle(
+        name="hexagon",
+        shape="_o_o\no_o_o\n_o_o",
+        puzzle_pieces=[
+            *(Polyhex(shape="o_o", name=str(i)) for i in range(3)),
+            Polyhex(shape="o", name="3"),
+        ],
+    ).post_init()
+
+
+def count_unique_solutions(puzzle, filepath):
+    with SolutionStore.create(filepath, puzzle) as store:
+        puzzle.solutions = store
+        return len(puzzle.solve())
+
+
+def test_store_roundtrip(tmp_path):
+    filepath = tmp_path / "solutions.bin"
+    puzzle = make_puzzle()
+    expected = [
+        [(pid, cid, tuple(map(int, offset))) for pid, cid, offset in solution]
+        for solution in puzzle.solve()
+    ]
+    visualized = puzzle.visualize_all_solutions()
+
+    puzzle = make_puzzle()
+    with SolutionStore.create(filepath, puzzle, dedup=False, block_size=1) as store:
+        puzzle.solutions = store
+        puzzle.solve()
+        assert len(store) == len(expected)
+
+    with SolutionStore.open(filepath, puzzle) as store:
+        puzzle.solutions = store
+        assert [
+            [(pid, cid, tuple(offset)) for pid, cid, offset in solution] for solution in store
+        ] == expected
+        assert puzzle.visualize_all_solutions() == visualized
+        with pytest.raises(io.UnsupportedOperation):
+            store.add(store[0])
+
+
+def test_store_rejects_other_puzzle(tmp_path):
+    filepath = tmp_path / "solutions.bin"
+    puzzle = make_puzzle()
+    with SolutionStore.create(filepath, puzzle) as puzzle.solutions:
+        puzzle.solve()
+
+    for other in [make_puzzle(p1_flip=False), make_domino_puzzle()]:
+        with pytest.raises(ValueError):
+            SolutionStore.open(filepath, other)
+
+
+def test_store_recovers_unclosed(tmp_path):
+    filepath = tmp_path / "solutions.bin"
+    puzzle = make_domino_puzzle()
+    with SolutionStore.create(filepath, puzzle, dedup=False, block_size=8) as store:
+        puzzle.solutions = store
+        puzzle.solve()
+        visualized = puzzle.visualize_all_solutions()
+        block_offsets = store.block_offsets
+
+    # cut off the trailer and the index, as if the solver had been killed
+    data = filepath.read_bytes()
+    filepath.write_bytes(data[: -TRAILER.size - 8 * len(block_offsets)])
+    with SolutionStore.open(filepath, puzzle) as store:
+        puzzle.solutions = store
+        assert len(store) == 120
+        assert puzzle.visualize_all_solutions() == visualized
+
+    # cut in the middle of the last block, which is then dropped
+    filepath.write_bytes(data[: block_offsets[-1] + 10])
+    with SolutionStore.open(filepath, puzzle) as store:
+        puzzle.solutions = store
+        assert len(store) == 112
+        assert puzzle.visualize_all_solutions() == {i: visualized[i] for i in range(112)}
+
+
+def test_store_rejects_invalid_file(tmp_path):
+    filepath = tmp_path / "solutions.bin"
+    for data in [b"", b"PPSS", b"not a solution store" * 10]:
+        filepath.write_bytes(data)
+        with pytest.raises(ValueError):
+            SolutionStore.open(filepath, make_puzzle())
+
+
+def test_store_dedup(tmp_path):
+    # both solutions are mirror images of each other
+    assert count_unique_solutions(make_puzzle(), tmp_path / "solutions.bin") == 1
+
+
+def test_store_dedup_without_flip(tmp_path):
+    # the board is mirror-symmetric, but the mirror image of the only solution is not a
+    # solution, so it must not be skipped in favour of that image
+    puzzle = make_puzzle(p2_flip=False)
+    assert len(list(gen_board_symmetries(puzzle))) == 1
+    assert len(make_puzzle(p2_flip=False).solve()) == 1
+    assert count_unique_solutions(puzzle, tmp_path / "solutions.bin") == 1
+
+
+def test_store_dedup_rotations(tmp_path):
+    puzzle = make_domino_puzzle()
+    assert len(list(gen_board_symmetries(puzzle))) == 4
+    assert len(make_domino_puzzle().solve()) == 120
+    assert count_unique_solutions(puzzle, tmp_path / "solutions.bin") == 36
+
+
+def test_store_dedup_hexagon(tmp_path):
+    puzzle = make_hexagon_puzzle()
+    assert len(list(gen_board_symmetries(puzzle))) == 12
+    assert len(make_hexagon_puzzle().solve()) == 120
+    assert count_unique_solutions(puzzle, tmp_path / "solutions.bin") == 10